@@ -10,34 +10,70 @@ Usage:
     hermit task rm ID                 Remove a task
     hermit groups                     List groups
     hermit status                     Check daemon status
+    hermit serve-cli                  Run commands read from stdin (one per line)
 """
 
 import argparse
+import functools
+import heapq
 import json
 import os
+import queue
+import re
+import selectors
+import shlex
 import socket
-import sqlite3
-import subprocess
+import struct
 import sys
 import threading
 import time
-import uuid
-from datetime import datetime, timezone, timedelta
+from contextlib import contextmanager
 from pathlib import Path
 
+
+def json_dumps(obj) -> bytes:
+    """Serialize to JSON bytes (stdlib; see use_fast_json)."""
+    return json.dumps(obj).encode()
+
+
+json_loads = json.loads
+
+
+def use_fast_json():
+    """Switch the JSON helpers to orjson, if installed.
+
+    Only the daemon calls this: it parses large sandbox output, while CLI
+    messages are too small to repay orjson's import time.
+    """
+    global json_dumps, json_loads
+    try:
+        import orjson
+    except ImportError:
+        return
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+
+
 # Paths
 BASE_DIR = Path(__file__).parent.resolve()
 GROUPS_DIR = BASE_DIR / "groups"
+GROUPS_DIR_STR = str(GROUPS_DIR)  # Joined per message without building Path objects
 DATA_DIR = BASE_DIR / "data"
 DB_PATH = DATA_DIR / "hermit.db"
 SOCKET_PATH = DATA_DIR / "hermit.sock"
 PID_FILE = DATA_DIR / "hermit.pid"
 
-SCHEDULER_INTERVAL = 60  # Check for due tasks every 60 seconds
-HOT_RELOAD_INTERVAL = 2  # Check for code changes every 2 seconds
+USAGE_UPDATE_INTERVAL = 300  # Refresh usage stats every 5 minutes
+TASK_RETRY_DELAY = 60  # Retry due tasks whose scheduler pass failed after a minute
+SCHEDULER_WORKERS = 4  # Groups whose due tasks run concurrently
+CLIENT_WORKERS = 8  # Concurrent blocking client requests (send, await)
+MAX_PENDING_RESULTS = 256  # Finished send_async results kept for clients that never await them
+HOT_RELOAD_INTERVAL = 2  # Poll for code changes every 2 seconds (when inotify is unavailable)
+DEBUG = bool(os.environ.get("HERMIT_DEBUG"))  # Log prompts as the daemon handles them
 
 # Tools directory
-HERMIT_DIR = Path.home() / ".hermit"
+HOME_DIR = Path.home()
+HERMIT_DIR = HOME_DIR / ".hermit"
 TOOLS_DIR = HERMIT_DIR / "tools"
 CONFIG_DIR = HERMIT_DIR / "config"  # For tool configs (gh, etc.)
 
@@ -57,8 +93,9 @@ TOOL_URLS = {
 
 def init_db():
     """Initialize SQLite database."""
+    from datetime import datetime
     DATA_DIR.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_db()
     conn.executescript("""
         CREATE TABLE IF NOT EXISTS groups (
             id INTEGER PRIMARY KEY,
@@ -82,64 +119,137 @@ def init_db():
             group_name TEXT NOT NULL,
             cron TEXT NOT NULL,
             prompt TEXT NOT NULL,
-            next_run TEXT,
+            next_run_ts INTEGER,
             last_run TEXT,
             last_result TEXT,
             status TEXT DEFAULT 'active',
             created_at TEXT DEFAULT CURRENT_TIMESTAMP
         );
-        CREATE INDEX IF NOT EXISTS idx_tasks_next_run ON tasks(next_run);
         CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
     """)
-    conn.close()
 
+    # Migrate older databases: next_run ISO TEXT -> next_run_ts epoch INTEGER
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+    if "next_run_ts" not in columns:
+        rows = conn.execute("SELECT id, next_run FROM tasks WHERE next_run IS NOT NULL").fetchall()
+        with transaction(conn):
+            conn.execute("ALTER TABLE tasks ADD COLUMN next_run_ts INTEGER")
+            conn.executemany(
+                "UPDATE tasks SET next_run_ts = ? WHERE id = ?",
+                [(int(datetime.fromisoformat(r["next_run"]).timestamp()), r["id"]) for r in rows]
+            )
+
+    conn.executescript("""
+        DROP INDEX IF EXISTS idx_tasks_next_run;
+        CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks(status, next_run_ts);
+    """)
+
+
+# Per-connection settings, applied once when a thread opens its connection.
+# WAL lets the scheduler read while client threads write.
+DB_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+"""
 
-def get_db():
-    """Get database connection."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+# Statements run on every request/scheduler pass. Kept as constants so each
+# thread's connection prepares them once and reuses them from sqlite3's
+# statement cache.
+# Get-or-create in one statement: the no-op update makes RETURNING yield existing rows too.
+# RETURNING needs SQLite 3.35+; older versions insert-or-ignore and then select.
+SQL_UPSERT_GROUP = "INSERT INTO groups (name, folder) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET name = excluded.name RETURNING *"
+SQL_INSERT_GROUP_IGNORE = "INSERT OR IGNORE INTO groups (name, folder) VALUES (?, ?)"
+SQL_GET_GROUP = "SELECT * FROM groups WHERE name = ?"
+SQL_UPDATE_SESSION = "UPDATE groups SET session_id = ? WHERE name = ?"
+SQL_LIST_GROUPS = "SELECT name, folder, session_id, created_at FROM groups ORDER BY name"
+SQL_INSERT_TASK = "INSERT INTO tasks (id, group_name, cron, prompt, next_run_ts, status) VALUES (?, ?, ?, ?, ?, 'active')"
+SQL_LIST_TASKS = (
+    "SELECT id, group_name, cron, substr(prompt, 1, 60) AS prompt_head, next_run_ts, last_run,"
+    " substr(last_result, 1, 60) AS last_result_head, status FROM tasks ORDER BY created_at"
+)
+SQL_DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+SQL_GET_TASK = "SELECT * FROM tasks WHERE id = ?"
+SQL_GET_SCHEDULE = "SELECT next_run_ts, id FROM tasks WHERE status = 'active' AND next_run_ts IS NOT NULL"
+SQL_UPDATE_TASK_AFTER_RUN = "UPDATE tasks SET last_run = ?, last_result = ?, next_run_ts = ?, status = ? WHERE id = ?"
+
+_tls = threading.local()
+
+
+def get_db() -> "sqlite3.Connection":
+    """Get this thread's database connection (opened once, then reused)."""
+    import sqlite3
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        # Autocommit; writes go through transaction() for explicit locking
+        conn = sqlite3.connect(DB_PATH, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(DB_PRAGMAS)
+        _tls.conn = conn
     return conn
 
 
+@contextmanager
+def transaction(conn: "sqlite3.Connection"):
+    """Run a write transaction, taking the write lock up front (BEGIN IMMEDIATE)."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+# Group rows by name, filled on first lookup; update_session keeps them current
+_groups: dict[str, dict] = {}
+_groups_lock = threading.Lock()
+
+
 def get_or_create_group(name: str) -> dict:
-    """Get or create a group by name."""
+    """Get or create a group by name.
+
+    The row is cached after the first lookup (which also creates the folder),
+    so repeat messages skip SQLite and mkdir.
+    """
+    cached = _groups.get(name)
+    if cached is not None:
+        return dict(cached)
+
     folder = name.lower().replace(" ", "-")
     group_path = GROUPS_DIR / folder
     group_path.mkdir(parents=True, exist_ok=True)
 
+    import sqlite3
     conn = get_db()
-    cur = conn.cursor()
-
-    cur.execute("SELECT * FROM groups WHERE name = ?", (name,))
-    row = cur.fetchone()
-
-    if row:
-        group = dict(row)
-    else:
-        cur.execute(
-            "INSERT INTO groups (name, folder) VALUES (?, ?)",
-            (name, folder)
-        )
-        conn.commit()
-        group = {"id": cur.lastrowid, "name": name, "folder": folder, "session_id": None}
-
-    conn.close()
-    return group
+    with _groups_lock:
+        with transaction(conn):
+            if sqlite3.sqlite_version_info >= (3, 35):
+                row = conn.execute(SQL_UPSERT_GROUP, (name, folder)).fetchone()
+            else:
+                conn.execute(SQL_INSERT_GROUP_IGNORE, (name, folder))
+                row = conn.execute(SQL_GET_GROUP, (name,)).fetchone()
+        _groups[name] = dict(row)
+    return dict(row)
 
 
 def update_session(group_name: str, session_id: str | None):
     """Update the session ID for a group."""
     conn = get_db()
-    conn.execute("UPDATE groups SET session_id = ? WHERE name = ?", (session_id, group_name))
-    conn.commit()
-    conn.close()
+    with _groups_lock:
+        with transaction(conn):
+            conn.execute(SQL_UPDATE_SESSION, (session_id, group_name))
+        cached = _groups.get(group_name)
+        if cached is not None:
+            _groups[group_name] = {**cached, "session_id": session_id}
 
 
 def list_groups() -> list[dict]:
     """List all groups."""
     conn = get_db()
-    rows = conn.execute("SELECT name, folder, session_id, created_at FROM groups ORDER BY name").fetchall()
-    conn.close()
+    rows = conn.execute(SQL_LIST_GROUPS).fetchall()
     return [dict(r) for r in rows]
 
 
@@ -147,21 +257,27 @@ def list_groups() -> list[dict]:
 # Tasks / Scheduler
 # ============================================================================
 
-def parse_cron(cron: str) -> dict | None:
-    """Parse simple cron expression. Supports: @hourly, @daily, @weekly, */N, or once:DATETIME."""
+@functools.lru_cache(maxsize=256)
+def parse_cron(cron: str) -> tuple[str, int | None, int | None] | None:
+    """Parse simple cron expression. Supports: @hourly, @daily, @weekly, */N, or once:DATETIME.
+
+    Returns (type, minutes, timestamp): ("interval", N, None), ("once", N, None)
+    for once:+Nm, or ("once", None, EPOCH) for once:DATETIME. Results are cached.
+    """
+    from datetime import datetime
     cron = cron.strip()
 
     if cron.lower() == "@hourly":
-        return {"type": "interval", "minutes": 60}
+        return ("interval", 60, None)
     elif cron.lower() == "@daily":
-        return {"type": "interval", "minutes": 1440}
+        return ("interval", 1440, None)
     elif cron.lower() == "@weekly":
-        return {"type": "interval", "minutes": 10080}
+        return ("interval", 10080, None)
     elif cron.lower().startswith("*/"):
         try:
             minutes = int(cron[2:])
             if minutes > 0:
-                return {"type": "interval", "minutes": minutes}
+                return ("interval", minutes, None)
         except ValueError:
             pass
     elif cron.lower().startswith("once:"):
@@ -170,97 +286,89 @@ def parse_cron(cron: str) -> dict | None:
             # Support +Nm for "N minutes from now"
             if time_str.startswith("+") and time_str.endswith("m"):
                 minutes = int(time_str[1:-1])
-                return {"type": "once", "minutes": minutes}
+                return ("once", minutes, None)
             # Otherwise parse as ISO datetime
             run_time = datetime.fromisoformat(time_str)
-            return {"type": "once", "datetime": run_time.isoformat()}
+            return ("once", None, int(run_time.timestamp()))
         except (ValueError, TypeError):
             pass
 
     return None
 
 
-def calc_next_run(cron: str, from_time: datetime | None = None, after_run: bool = False) -> str | None:
-    """Calculate next run time based on cron expression."""
+def calc_next_run(cron: str, from_time: float | None = None, after_run: bool = False) -> int | None:
+    """Calculate next run time (Unix epoch seconds) based on cron expression."""
     parsed = parse_cron(cron)
     if not parsed:
         return None
+    kind, minutes, run_at = parsed
 
-    base = from_time or datetime.now()
+    base = from_time or time.time()
 
-    if parsed["type"] == "interval":
-        next_time = base.timestamp() + (parsed["minutes"] * 60)
-        return datetime.fromtimestamp(next_time).isoformat()
-    elif parsed["type"] == "once":
+    if kind == "interval":
+        return int(base + minutes * 60)
+    elif kind == "once":
         if after_run:
             return None  # No next run after one-time task completes
-        if "minutes" in parsed:
-            next_time = base.timestamp() + (parsed["minutes"] * 60)
-            return datetime.fromtimestamp(next_time).isoformat()
-        return parsed.get("datetime")
+        if minutes is not None:
+            return int(base + minutes * 60)
+        return run_at
 
     return None
 
 
+def format_ts(ts: int | None) -> str | None:
+    """Format an epoch timestamp as local ISO time for display."""
+    from datetime import datetime
+    return datetime.fromtimestamp(ts).isoformat() if ts is not None else None
+
+
 def create_task(group_name: str, cron: str, prompt: str) -> dict:
     """Create a scheduled task."""
+    import secrets
     parsed = parse_cron(cron)
     if not parsed:
         return {"status": "error", "error": f"Invalid cron: {cron}. Use @hourly, @daily, @weekly, */N, once:+Nm, or once:DATETIME"}
 
-    task_id = str(uuid.uuid4())[:8]
-    next_run = calc_next_run(cron)
+    task_id = secrets.token_hex(4)
+    next_run_ts = calc_next_run(cron)
 
     conn = get_db()
-    conn.execute(
-        "INSERT INTO tasks (id, group_name, cron, prompt, next_run, status) VALUES (?, ?, ?, ?, ?, 'active')",
-        (task_id, group_name, cron, prompt, next_run)
-    )
-    conn.commit()
-    conn.close()
+    with transaction(conn):
+        conn.execute(SQL_INSERT_TASK, (task_id, group_name, cron, prompt, next_run_ts))
 
-    return {"status": "ok", "task_id": task_id, "next_run": next_run}
+    return {"status": "ok", "task_id": task_id, "next_run_ts": next_run_ts}
 
 
 def list_tasks() -> list[dict]:
-    """List all tasks."""
+    """List all tasks, with prompt and last result cut to 60 chars for display."""
     conn = get_db()
-    rows = conn.execute(
-        "SELECT id, group_name, cron, prompt, next_run, last_run, last_result, status FROM tasks ORDER BY created_at"
-    ).fetchall()
-    conn.close()
+    rows = conn.execute(SQL_LIST_TASKS).fetchall()
     return [dict(r) for r in rows]
 
 
 def delete_task(task_id: str) -> dict:
     """Delete a task."""
     conn = get_db()
-    cur = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-    conn.commit()
-    conn.close()
+    with transaction(conn):
+        cur = conn.execute(SQL_DELETE_TASK, (task_id,))
 
     if cur.rowcount > 0:
         return {"status": "ok", "message": f"Task {task_id} deleted"}
     return {"status": "error", "error": f"Task {task_id} not found"}
 
 
-def get_due_tasks() -> list[dict]:
-    """Get tasks that are due to run."""
-    now = datetime.now().isoformat()
+def get_task(task_id: str) -> dict | None:
+    """Get a task by ID."""
     conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM tasks WHERE status = 'active' AND next_run IS NOT NULL AND next_run <= ?",
-        (now,)
-    ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    row = conn.execute(SQL_GET_TASK, (task_id,)).fetchone()
+    return dict(row) if row else None
 
 
 def install_tool(name: str) -> dict:
     """Download and install a tool to ~/.hermit/tools/"""
     import tarfile
     import urllib.request
-    import shutil
 
     if name not in TOOL_URLS:
         available = ", ".join(TOOL_URLS.keys())
@@ -274,28 +382,27 @@ def install_tool(name: str) -> dict:
 
     try:
         if url.endswith(".tar.gz"):
-            # Download and extract tarball
-            tmp_tar = TOOLS_DIR / f"{name}.tar.gz"
-            urllib.request.urlretrieve(url, tmp_tar)
-
-            with tarfile.open(tmp_tar, "r:gz") as tar:
-                # Find the binary in the archive
-                for member in tar.getmembers():
-                    if member.name.endswith(f"/{name}") or member.name == name:
+            # Mode/owner are fixed up by the chmod below
+            extract_kwargs = {"set_attrs": False}
+            if hasattr(tarfile, "data_filter"):
+                extract_kwargs["filter"] = "data"
+
+            # Stream the tarball straight from the download (no temp file)
+            with urllib.request.urlopen(url) as resp, tarfile.open(fileobj=resp, mode="r|gz") as tar:
+                # Find the binary in one pass: stop at an exact match, otherwise
+                # keep the first file matching a common pattern (e.g. "fd-v10")
+                found_fallback = False
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    basename = member.name.rsplit("/", 1)[-1]
+                    exact = basename == name
+                    if exact or (not found_fallback and basename.startswith(name)):
                         member.name = name  # Flatten path
-                        tar.extract(member, TOOLS_DIR)
-                        break
-                else:
-                    # Try to find binary by common patterns
-                    for member in tar.getmembers():
-                        basename = Path(member.name).name
-                        if basename == name or basename.startswith(name):
-                            if member.isfile():
-                                member.name = name
-                                tar.extract(member, TOOLS_DIR)
-                                break
-
-            tmp_tar.unlink()
+                        tar.extract(member, TOOLS_DIR, **extract_kwargs)
+                        if exact:
+                            break
+                        found_fallback = True
         else:
             # Direct binary download
             urllib.request.urlretrieve(url, tool_path)
@@ -310,68 +417,128 @@ def install_tool(name: str) -> dict:
 
 def list_tools() -> list[str]:
     """List installed tools."""
-    if not TOOLS_DIR.exists():
+    # scandir entries carry the file type, so only the X_OK check hits the filesystem
+    try:
+        with os.scandir(TOOLS_DIR) as entries:
+            return [e.name for e in entries if e.is_file() and os.access(e.path, os.X_OK)]
+    except FileNotFoundError:
         return []
-    return [f.name for f in TOOLS_DIR.iterdir() if f.is_file() and os.access(f, os.X_OK)]
+
+
+# Open history files by group folder, kept for the daemon's lifetime
+_log_files = {}
+_log_lock = threading.Lock()
+
+
+def format_log_entry(role: str, content: str) -> str:
+    """Format a message as a history file entry."""
+    from datetime import datetime
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if role == "user":
+        return f"--- {timestamp} ---\n> {content}\n\n"
+    return f"--- {timestamp} ---\n{content}\n\n"
+
+
+def write_history(group_folder: str, text: str):
+    """Append pre-formatted entries to group's history file."""
+    with _log_lock:
+        f = _log_files.get(group_folder)
+        if f is None:
+            f = open(GROUPS_DIR / group_folder / "history.txt", "a", buffering=8192)
+            _log_files[group_folder] = f
+        f.write(text)
+        # The agent reads history.txt, so it must be on disk before the next run
+        f.flush()
 
 
 def log_message(group_folder: str, role: str, content: str):
     """Append message to group's history file."""
-    history_file = GROUPS_DIR / group_folder / "history.txt"
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    write_history(group_folder, format_log_entry(role, content))
 
-    with open(history_file, "a") as f:
-        f.write(f"--- {timestamp} ---\n")
-        if role == "user":
-            f.write(f"> {content}\n\n")
-        else:
-            f.write(f"{content}\n\n")
 
+def close_logs():
+    """Close all open history files."""
+    with _log_lock:
+        for f in _log_files.values():
+            f.close()
+        _log_files.clear()
 
-def update_task_after_run(task_id: str, result: str, cron: str):
-    """Update task after execution."""
-    now = datetime.now()
-    next_run = calc_next_run(cron, now, after_run=True)
 
-    # One-time tasks get marked completed
-    status = "completed" if next_run is None else "active"
+def update_tasks_after_run(runs: list[tuple[str, str, str]]) -> list[int | None]:
+    """Update tasks after execution in one transaction.
+
+    Takes (task_id, result, cron) tuples; returns each task's next run time, if any.
+    """
+    from datetime import datetime
+    now = datetime.now()
+    last_run = now.isoformat()
+    next_runs = []
+    updates = []
+    for task_id, result, cron in runs:
+        next_run_ts = calc_next_run(cron, now.timestamp(), after_run=True)
+        # One-time tasks get marked completed
+        status = "completed" if next_run_ts is None else "active"
+        next_runs.append(next_run_ts)
+        updates.append((last_run, result[:500], next_run_ts, status, task_id))
 
     conn = get_db()
-    conn.execute(
-        "UPDATE tasks SET last_run = ?, last_result = ?, next_run = ?, status = ? WHERE id = ?",
-        (now.isoformat(), result[:500], next_run, status, task_id)
-    )
-    conn.commit()
-    conn.close()
+    with transaction(conn):
+        conn.executemany(SQL_UPDATE_TASK_AFTER_RUN, updates)
+    return next_runs
+
+
+# Simple YAML parsing for oauth_token
+GH_TOKEN_RE = re.compile(r'oauth_token:\s*(\S+)')
+
+# Last parsed token, reused until hosts.yml's mtime changes
+_gh_token_cache = {"mtime": None, "token": None}
 
 
 def get_gh_token() -> str | None:
     """Read GH token from hermit's config (not user's personal config)."""
     hosts_file = CONFIG_DIR / "gh" / "hosts.yml"
-    if not hosts_file.exists():
+    try:
+        mtime = hosts_file.stat().st_mtime_ns
+    except OSError:
         return None
+    if mtime == _gh_token_cache["mtime"]:
+        return _gh_token_cache["token"]
+
+    token = None
     try:
-        import re
-        content = hosts_file.read_text()
-        # Simple YAML parsing for oauth_token
-        match = re.search(r'oauth_token:\s*(\S+)', content)
+        match = GH_TOKEN_RE.search(hosts_file.read_text())
         if match:
-            return match.group(1)
+            token = match.group(1)
     except Exception:
         pass
-    return None
+    _gh_token_cache.update(mtime=mtime, token=token)
+    return token
 
 
 # ============================================================================
 # Sandbox
 # ============================================================================
 
-def build_bwrap_args(group: dict) -> list[str]:
-    """Build bwrap command arguments."""
-    group_path = GROUPS_DIR / group["folder"]
+# Group-independent bwrap arguments, keyed by whether TOOLS_DIR exists
+_bwrap_static: dict[bool, tuple[tuple[str, ...], tuple[str, ...]]] = {}
 
-    args = [
-        "bwrap",
+
+def bwrap_static_args() -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Get the bwrap arguments before and after the workspace bind.
+
+    Built once (including the home probes and credential copy); rebuilt only
+    if the tools directory appears later. Once it has been seen, the
+    per-call stat is skipped too.
+    """
+    import shutil
+    tools_installed = True in _bwrap_static or TOOLS_DIR.exists()
+    cached = _bwrap_static.get(tools_installed)
+    if cached:
+        return cached
+
+    # Absolute path: the child execs it directly instead of searching PATH
+    head = (
+        shutil.which("bwrap") or "bwrap",
         "--ro-bind", "/usr", "/usr",
         "--ro-bind", "/lib", "/lib",
         "--ro-bind", "/lib64", "/lib64",
@@ -383,11 +550,10 @@ def build_bwrap_args(group: dict) -> list[str]:
         "--proc", "/proc",
         "--dev", "/dev",
         "--tmpfs", "/tmp",
-        "--bind", str(group_path), "/workspace",
-        "--tmpfs", "/home",
-    ]
+    )
+    tail = ["--tmpfs", "/home"]
 
-    home = Path.home()
+    home = HOME_DIR
     claude_bin = home / ".local" / "bin"
     claude_share = home / ".local" / "share" / "claude"
     user_claude_creds = home / ".claude" / ".credentials.json"
@@ -399,30 +565,29 @@ def build_bwrap_args(group: dict) -> list[str]:
     # Copy user's credentials if hermit doesn't have its own yet
     hermit_creds = hermit_claude / ".credentials.json"
     if user_claude_creds.exists() and not hermit_creds.exists():
-        import shutil
         shutil.copy2(user_claude_creds, hermit_creds)
 
-    args.extend(["--dir", str(home)])
+    tail.extend(["--dir", str(home)])
 
     # Mount hermit's .claude as ~/.claude (isolated from user's plugins/settings)
     if hermit_claude.exists():
-        args.extend(["--bind", str(hermit_claude), str(home / ".claude")])
+        tail.extend(["--bind", str(hermit_claude), str(home / ".claude")])
     if claude_bin.exists():
-        args.extend(["--dir", str(home / ".local")])
-        args.extend(["--ro-bind", str(claude_bin), str(claude_bin)])
+        tail.extend(["--dir", str(home / ".local")])
+        tail.extend(["--ro-bind", str(claude_bin), str(claude_bin)])
     if claude_share.exists():
-        args.extend(["--ro-bind", str(claude_share), str(claude_share)])
+        tail.extend(["--ro-bind", str(claude_share), str(claude_share)])
 
     # Mount hermit tools directory
-    if TOOLS_DIR.exists():
-        args.extend(["--ro-bind", str(TOOLS_DIR), str(TOOLS_DIR)])
+    if tools_installed:
+        tail.extend(["--ro-bind", str(TOOLS_DIR), str(TOOLS_DIR)])
 
     # Build PATH with available tools
     path_parts = [str(claude_bin), "/usr/bin", "/bin"]
-    if TOOLS_DIR.exists():
+    if tools_installed:
         path_parts.insert(0, str(TOOLS_DIR))
 
-    args.extend([
+    tail.extend([
         "--setenv", "HOME", str(home),
         "--setenv", "USER", home.name,
         "--setenv", "PATH", ":".join(path_parts),
@@ -432,6 +597,15 @@ def build_bwrap_args(group: dict) -> list[str]:
         "--die-with-parent",
     ])
 
+    cached = _bwrap_static[tools_installed] = (head, tuple(tail))
+    return cached
+
+
+def build_bwrap_args(group: dict) -> list[str]:
+    """Build bwrap command arguments."""
+    head, tail = bwrap_static_args()
+    args = [*head, "--bind", os.path.join(GROUPS_DIR_STR, group["folder"]), "/workspace", *tail]
+
     # Pass GH_TOKEN from hermit's config (don't mount config files)
     gh_token = get_gh_token()
     if gh_token:
@@ -440,8 +614,66 @@ def build_bwrap_args(group: dict) -> list[str]:
     return args
 
 
+STDERR_TAIL = 500  # Bytes of stderr kept for error messages
+
+
+def drain_process(proc, timeout: float, input_data: bytes = b"") -> tuple[bytearray, bytes]:
+    """Feed input_data to a process's stdin and read its stdout to EOF.
+
+    All pipes are serviced as they become ready, so a large input can't
+    deadlock against a full stdout pipe; stdout grows in one buffer and only
+    the tail of stderr is kept. Kills the process and raises
+    subprocess.TimeoutExpired once the timeout passes.
+    """
+    import subprocess
+    deadline = time.monotonic() + timeout
+    out = bytearray()
+    err = bytearray()
+    bufs = {proc.stdout.fileno(): out, proc.stderr.fileno(): err}
+    pending = memoryview(input_data)
+    with selectors.DefaultSelector() as sel:
+        for fd in bufs:
+            sel.register(fd, selectors.EVENT_READ)
+        if proc.stdin:
+            if pending:
+                os.set_blocking(proc.stdin.fileno(), False)
+                sel.register(proc.stdin.fileno(), selectors.EVENT_WRITE)
+            else:
+                proc.stdin.close()
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                proc.kill()
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            for key, _ in sel.select(remaining):
+                if key.events & selectors.EVENT_WRITE:
+                    try:
+                        pending = pending[os.write(key.fd, pending):]
+                    except BrokenPipeError:
+                        pending = pending[:0]  # Child exited without reading it all
+                    if not pending:
+                        sel.unregister(key.fd)
+                        proc.stdin.close()
+                    continue
+                chunk = os.read(key.fd, 65536)
+                if not chunk:
+                    sel.unregister(key.fd)
+                    continue
+                buf = bufs[key.fd]
+                buf += chunk
+                if buf is err and len(err) > 8 * STDERR_TAIL:
+                    del err[:-STDERR_TAIL]
+    try:
+        proc.wait(max(deadline - time.monotonic(), 0))
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        raise
+    return out, bytes(err[-STDERR_TAIL:])
+
+
 def run_sandbox(group: dict, prompt: str, session_id: str | None = None) -> dict:
     """Run Claude Code in bwrap sandbox."""
+    import subprocess
     bwrap_args = build_bwrap_args(group)
 
     cmd = bwrap_args + ["claude", "-p", "--output-format", "json", "--dangerously-skip-permissions"]
@@ -449,31 +681,36 @@ def run_sandbox(group: dict, prompt: str, session_id: str | None = None) -> dict
     if session_id:
         cmd.extend(["--resume", session_id])
 
-    cmd.append(prompt)
-
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-
-        if result.returncode != 0:
+        # Capture bytes: only the parts we keep get decoded. No preexec_fn,
+        # cwd or session/uid changes, so CPython spawns via vfork() rather
+        # than copying the daemon's page tables with fork(). The prompt goes
+        # in on stdin, so its size isn't bounded by ARG_MAX.
+        with subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        ) as proc:
+            stdout, stderr_tail = drain_process(proc, 300, prompt.encode())
+
+        if proc.returncode != 0:
             return {
                 "status": "error",
-                "error": f"Claude exited with code {result.returncode}: {result.stderr[-500:]}"
+                "error": f"Claude exited with code {proc.returncode}: {stderr_tail.decode('utf-8', 'replace')}"
             }
 
         try:
-            output = json.loads(result.stdout)
-            return {
-                "status": "success",
-                "result": output.get("result", result.stdout),
-                "session_id": output.get("session_id")
-            }
-        except json.JSONDecodeError:
-            return {"status": "success", "result": result.stdout}
+            output = json_loads(stdout)
+        except ValueError:
+            return {"status": "success", "result": stdout.decode("utf-8", "replace")}
+
+        if "result" in output:
+            result_text = output["result"]
+        else:
+            result_text = stdout.decode("utf-8", "replace")
+        return {
+            "status": "success",
+            "result": result_text,
+            "session_id": output.get("session_id")
+        }
 
     except subprocess.TimeoutExpired:
         return {"status": "error", "error": "Sandbox timed out after 5 minutes"}
@@ -485,7 +722,7 @@ def run_sandbox(group: dict, prompt: str, session_id: str | None = None) -> dict
 # Usage Limits
 # ============================================================================
 
-CLAUDE_DIR = Path.home() / ".claude"
+CLAUDE_DIR = HOME_DIR / ".claude"
 HERMIT_CLAUDE_DIR = HERMIT_DIR / ".claude"
 USAGE_SESSION_DIRS = [CLAUDE_DIR / "projects", HERMIT_CLAUDE_DIR / "projects"]
 CREDENTIALS_FILE = CLAUDE_DIR / ".credentials.json"
@@ -523,6 +760,7 @@ def calculate_usage() -> dict:
     Note: This is a lower bound - excludes web (claude.ai) usage.
     Only counts Claude Code and Hermit sessions stored locally.
     """
+    from datetime import datetime, timedelta, timezone
     now = datetime.now(timezone.utc)
     five_hours_ago = now - timedelta(hours=5)
     seven_days_ago = now - timedelta(days=7)
@@ -548,7 +786,7 @@ def calculate_usage() -> dict:
                 with open(session_file, 'r') as f:
                     for line in f:
                         try:
-                            entry = json.loads(line)
+                            entry = json_loads(line)
                             if entry.get("type") != "assistant":
                                 continue
 
@@ -619,71 +857,302 @@ def update_usage_file(group_folder: str):
     central_file.write_text(json.dumps(usage, indent=2))
 
 
+# ============================================================================
+# IPC
+# ============================================================================
+
+# Messages are JSON bodies preceded by a 4-byte big-endian length.
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+MESSAGE_HEADER = struct.Struct("!I")
+
+
+def _recvn(sock: socket.socket, n: int) -> bytearray:
+    """Read exactly n bytes from a socket."""
+    buf = bytearray(n)
+    view = memoryview(buf)
+    offset = 0
+    while offset < n:
+        received = sock.recv_into(view[offset:])
+        if not received:
+            raise ConnectionError("Connection closed mid-message")
+        offset += received
+    return buf
+
+
+def send_message(sock: socket.socket, message: dict):
+    """Send a length-prefixed JSON message."""
+    body = json_dumps(message)
+    header = MESSAGE_HEADER.pack(len(body))
+    # Header and body go out in one vectored write, without concatenating them
+    sent = sock.sendmsg([header, body])
+    if sent < len(header):
+        sock.sendall(header[sent:])
+        sock.sendall(body)
+    elif sent < len(header) + len(body):
+        sock.sendall(memoryview(body)[sent - len(header):])
+
+
+def recv_message(sock: socket.socket) -> dict | None:
+    """Receive a length-prefixed JSON message. Returns None if the peer closed first."""
+    header = sock.recv(4)
+    if not header:
+        return None
+    if len(header) < 4:
+        header += _recvn(sock, 4 - len(header))
+    (size,) = MESSAGE_HEADER.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message too large: {size} bytes")
+    return json_loads(_recvn(sock, size))
+
+
 # ============================================================================
 # Daemon
 # ============================================================================
 
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x08
+IN_MOVED_TO = 0x80
+
+
+def inotify_watch(directory: Path, mask: int) -> int | None:
+    """Return an inotify fd watching directory, or None if inotify is unavailable."""
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
 class Daemon:
     """Hermit daemon - manages sessions, scheduler, and handles requests."""
 
     def __init__(self, hot_reload=False):
+        import concurrent.futures
         self.running = False
         self.scheduler_thread = None
         self.hot_reload = hot_reload
         self.script_path = Path(__file__).resolve()
         self.script_mtime = self.script_path.stat().st_mtime
+        # Min-heap of (next_run epoch, task_id); guarded by _cv
+        self._cv = threading.Condition()
+        self._heap: list[tuple[int, str]] = []
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=SCHEDULER_WORKERS)
+        # Groups with tasks on the pool -> tasks that fell due meanwhile; guarded by _cv
+        self._running_groups: dict[str, list[dict]] = {}
+        self._client_pool = concurrent.futures.ThreadPoolExecutor(max_workers=CLIENT_WORKERS)
+        # Connections handed back by pool workers, re-registered by the selector loop
+        self._returned: queue.SimpleQueue[socket.socket] = queue.SimpleQueue()
+        self._wake_r, self._wake_w = socket.socketpair()
+        # send_async: one single-worker pool per group runs its prompts in FIFO
+        # order; results wait in _pending (by request ID) until awaited
+        self._async_pools: dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        self._pending: dict[int, concurrent.futures.Future] = {}
+        self._pending_lock = threading.Lock()
+        self._next_req_id = 0
+
+    def reload(self):
+        """Re-exec the daemon with the current code."""
+        print("\nCode changed, reloading...")
+        SOCKET_PATH.unlink(missing_ok=True)
+        PID_FILE.unlink(missing_ok=True)
+        os.execv(sys.executable, [sys.executable] + sys.argv)
 
     def check_reload(self):
-        """Check if script changed and re-exec if so."""
+        """Wait for the script to change and re-exec if so.
+
+        Blocks on inotify events for the script's directory (editors that save
+        via rename show up as IN_MOVED_TO). Falls back to mtime polling.
+        """
+        fd = inotify_watch(self.script_path.parent, IN_CLOSE_WRITE | IN_MOVED_TO)
+        if fd is None:
+            self.poll_reload()
+            return
+
+        script_name = os.fsencode(self.script_path.name)
+        while self.running and self.hot_reload:
+            try:
+                events = os.read(fd, 4096)
+                offset = 0
+                while offset < len(events):
+                    _wd, _mask, _cookie, length = struct.unpack_from("iIII", events, offset)
+                    name = events[offset + 16:offset + 16 + length].rstrip(b"\0")
+                    offset += 16 + length
+                    if name == script_name:
+                        self.reload()
+            except Exception as e:
+                print(f"Reload check error: {e}")
+                time.sleep(HOT_RELOAD_INTERVAL)
+
+    def poll_reload(self):
+        """Check the script's mtime periodically and re-exec if it changed."""
         while self.running and self.hot_reload:
             try:
                 current_mtime = self.script_path.stat().st_mtime
                 if current_mtime != self.script_mtime:
-                    print("\nCode changed, reloading...")
-                    SOCKET_PATH.unlink(missing_ok=True)
-                    PID_FILE.unlink(missing_ok=True)
-                    os.execv(sys.executable, [sys.executable] + sys.argv)
+                    self.reload()
             except Exception as e:
                 print(f"Reload check error: {e}")
             time.sleep(HOT_RELOAD_INTERVAL)
 
+    def load_schedule(self):
+        """Load active tasks into the scheduler heap."""
+        # Served from idx_tasks_due without touching the task rows
+        heap = [tuple(row) for row in get_db().execute(SQL_GET_SCHEDULE)]
+        heapq.heapify(heap)
+        with self._cv:
+            self._heap = heap
+            self._cv.notify()
+
+    def schedule_task(self, task_id: str, next_run_ts: int | None):
+        """Add a task to the scheduler heap and wake the scheduler."""
+        if next_run_ts is None:
+            return
+        with self._cv:
+            heapq.heappush(self._heap, (next_run_ts, task_id))
+            self._cv.notify()
+
+    def unschedule_task(self, task_id: str):
+        """Remove a task from the scheduler heap."""
+        with self._cv:
+            self._heap = [entry for entry in self._heap if entry[1] != task_id]
+            heapq.heapify(self._heap)
+            self._cv.notify()
+
     def run_scheduler(self):
-        """Scheduler loop - runs due tasks and updates usage every 5 min."""
+        """Scheduler loop - sleeps until the next task is due, updates usage every 5 min."""
         print("Scheduler started")
-        usage_update_counter = 0
+        next_usage_update = time.time() + USAGE_UPDATE_INTERVAL
         while self.running:
             try:
+                with self._cv:
+                    now = time.time()
+                    deadline = min(self._heap[0][0], next_usage_update) if self._heap else next_usage_update
+                    if deadline > now:
+                        # Woken early by schedule/unschedule; recompute the deadline
+                        self._cv.wait(deadline - now)
+                        continue
+                    due_ids = []
+                    while self._heap and self._heap[0][0] <= now:
+                        due_ids.append(heapq.heappop(self._heap)[1])
+
+                # Groups share no state, so run them in parallel; tasks within
+                # a group stay sequential to preserve session ordering.
+                by_group: dict[str, list[dict]] = {}
+                try:
+                    for task_id in due_ids:
+                        task = get_task(task_id)
+                        if task and task["status"] == "active":
+                            by_group.setdefault(task["group_name"], []).append(task)
+                except Exception:
+                    # Popped but never dispatched: retry later, like the old per-minute poll
+                    for task_id in due_ids:
+                        self.schedule_task(task_id, int(now) + TASK_RETRY_DELAY)
+                    raise
+                # Workers reschedule each group's tasks as it finishes; don't wait here
+                for group_name, tasks in by_group.items():
+                    self.dispatch_group(group_name, tasks)
+
                 # Update usage stats every 5 minutes
-                usage_update_counter += 1
-                if usage_update_counter >= 5:
-                    usage_update_counter = 0
-                    usage = calculate_usage()
-                    central_file = CLAUDE_DIR / "usage-limits.json"
-                    central_file.write_text(json.dumps(usage, indent=2))
-
-                due_tasks = get_due_tasks()
-                for task in due_tasks:
-                    print(f"Running task {task['id']}: {task['prompt'][:50]}...")
-                    group = get_or_create_group(task["group_name"])
-                    result = run_sandbox(group, task["prompt"], group.get("session_id"))
-
-                    # Log to history
-                    log_message(group["folder"], "user", f"[task:{task['id']}] {task['prompt']}")
-                    result_text = result.get("result", result.get("error", ""))
-                    if result_text:
-                        log_message(group["folder"], "assistant", result_text)
-
-                    # Update session if task uses group context
-                    if result.get("session_id"):
-                        update_session(task["group_name"], result["session_id"])
-
-                    update_task_after_run(task["id"], result_text, task["cron"])
-                    update_usage_file(group["folder"])
+                if now >= next_usage_update:
+                    next_usage_update = now + USAGE_UPDATE_INTERVAL
+                    try:
+                        usage = calculate_usage()
+                        central_file = CLAUDE_DIR / "usage-limits.json"
+                        central_file.write_text(json.dumps(usage, indent=2))
+                    except Exception as e:
+                        print(f"Usage update error: {e}")
+            except Exception as e:
+                print(f"Scheduler error: {e}")
+                time.sleep(1)
+
+    def dispatch_group(self, group_name: str, tasks: list[dict]):
+        """Run a group's due tasks on the pool, or queue them if that group is already running."""
+        with self._cv:
+            queued = self._running_groups.get(group_name)
+            if queued is not None:
+                queued.extend(tasks)
+                return
+            self._running_groups[group_name] = []
+        self._pool.submit(self.run_group, group_name, tasks)
+
+    def run_group(self, group_name: str, tasks: list[dict]):
+        """Pool worker: run a group's tasks, then any that fell due meanwhile."""
+        while tasks:
+            unhandled = {task["id"] for task in tasks}
+            try:
+                folder, results = self.run_group_tasks(tasks)
+                next_runs = update_tasks_after_run(
+                    [(task["id"], result_text, task["cron"]) for task, result_text in results]
+                )
+                for (task, _), next_run_ts in zip(results, next_runs):
+                    self.schedule_task(task["id"], next_run_ts)
+                    unhandled.discard(task["id"])
                     print(f"Task {task['id']} completed")
+                if folder:
+                    try:
+                        update_usage_file(folder)
+                    except Exception as e:
+                        print(f"Usage update error: {e}")
             except Exception as e:
                 print(f"Scheduler error: {e}")
+            finally:
+                # Not rescheduled (the update failed): retry later
+                for task_id in unhandled:
+                    self.schedule_task(task_id, int(time.time()) + TASK_RETRY_DELAY)
+
+            with self._cv:
+                tasks = self._running_groups.pop(group_name)
+                if tasks:
+                    self._running_groups[group_name] = []
+
+    def run_group_tasks(self, tasks: list[dict]) -> tuple[str | None, list[tuple[dict, str]]]:
+        """Run one group's due tasks in order.
+
+        Returns the group folder (None if it couldn't be looked up) and
+        (task, result) pairs. Each task's history is written as soon as it
+        finishes, so the next run (and any interleaved send) sees it. A failing
+        task is recorded as an error result rather than raised, so its
+        siblings still run and every task gets rescheduled.
+        """
+        folder = None
+        results = []
+        for task in tasks:
+            if DEBUG:
+                print(f"Running task {task['id']}: {task['prompt'][:50]}...")
+            else:
+                print(f"Running task {task['id']}")
+            try:
+                group = get_or_create_group(task["group_name"])
+                folder = group["folder"]
+                result = run_sandbox(group, task["prompt"], group.get("session_id"))
 
-            time.sleep(SCHEDULER_INTERVAL)
+                # Update session if task uses group context
+                if result.get("session_id"):
+                    update_session(task["group_name"], result["session_id"])
+            except Exception as e:
+                result = {"status": "error", "error": f"Task failed: {e}"}
+
+            # Log to history
+            result_text = result.get("result", result.get("error", ""))
+            if folder:
+                entry = format_log_entry("user", f"[task:{task['id']}] {task['prompt']}")
+                if result_text:
+                    entry += format_log_entry("assistant", result_text)
+                try:
+                    write_history(folder, entry)
+                except Exception as e:
+                    print(f"History write error: {e}")
+
+            results.append((task, result_text))
+        return folder, results
 
     def handle_request(self, data: dict) -> dict:
         """Handle a request from a client."""
@@ -699,6 +1168,9 @@ class Daemon:
             if not prompt:
                 return {"status": "error", "error": "No prompt provided"}
 
+            if DEBUG:
+                print(f"[{group_name}] {prompt[:100]}...")
+
             group = get_or_create_group(group_name)
             result = run_sandbox(group, prompt, group.get("session_id"))
 
@@ -715,6 +1187,18 @@ class Daemon:
 
             return result
 
+        elif cmd == "send_async":
+            if not data.get("prompt"):
+                return {"status": "error", "error": "No prompt provided"}
+            return {"status": "ok", "req_id": self.queue_send(data.get("group", "default"), data["prompt"])}
+
+        elif cmd == "await":
+            with self._pending_lock:
+                future = self._pending.pop(data.get("req_id"), None)
+            if future is None:
+                return {"status": "error", "error": f"Unknown request: {data.get('req_id')}"}
+            return future.result()
+
         elif cmd == "groups":
             return {"status": "ok", "groups": list_groups()}
 
@@ -724,47 +1208,139 @@ class Daemon:
             return {"status": "ok", "message": f"Session cleared for {group_name}"}
 
         elif cmd == "task_add":
-            return create_task(
+            result = create_task(
                 data.get("group", "default"),
                 data.get("cron", ""),
                 data.get("prompt", "")
             )
+            if result.get("status") == "ok":
+                self.schedule_task(result["task_id"], result["next_run_ts"])
+            return result
 
         elif cmd == "task_list":
             return {"status": "ok", "tasks": list_tasks()}
 
         elif cmd == "task_rm":
-            return delete_task(data.get("task_id", ""))
+            task_id = data.get("task_id", "")
+            result = delete_task(task_id)
+            if result.get("status") == "ok":
+                self.unschedule_task(task_id)
+            return result
 
         else:
             return {"status": "error", "error": f"Unknown command: {cmd}"}
 
-    def handle_client(self, conn: socket.socket):
-        """Handle a single client connection."""
+    def queue_send(self, group_name: str, prompt: str) -> int:
+        """Queue a prompt behind the group's earlier ones; returns its request ID."""
+        import concurrent.futures
+        pool = self._async_pools.get(group_name)
+        if pool is None:
+            pool = self._async_pools[group_name] = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        future = pool.submit(self.handle_request, {"cmd": "send", "group": group_name, "prompt": prompt})
+
+        with self._pending_lock:
+            self._next_req_id += 1
+            req_id = self._next_req_id
+            self._pending[req_id] = future
+            excess = len(self._pending) - MAX_PENDING_RESULTS
+            if excess > 0:
+                # Drop the oldest finished results nobody came back for
+                for old_id in [i for i, f in self._pending.items() if f.done()][:excess]:
+                    del self._pending[old_id]
+        return req_id
+
+    def respond(self, conn: socket.socket, request: dict) -> bool:
+        """Handle a complete request and send the response.
+
+        Returns False (and closes the connection) if the response could not be sent.
+        """
         try:
-            data = b""
-            while True:
-                chunk = conn.recv(4096)
-                if not chunk:
-                    break
-                data += chunk
-                if b"\n" in data:
-                    break
-
-            if data:
-                request = json.loads(data.decode())
-                response = self.handle_request(request)
-                conn.sendall(json.dumps(response).encode() + b"\n")
+            response = self.handle_request(request)
         except Exception as e:
+            response = {"status": "error", "error": str(e)}
+        try:
+            send_message(conn, response)
+            return True
+        except Exception:
+            conn.close()
+            return False
+
+    def respond_in_pool(self, conn: socket.socket, request: dict):
+        """Respond from a worker thread, then hand the connection back to the selector loop."""
+        if self.respond(conn, request):
+            self._returned.put(conn)
+            self._wake_w.send(b"\0")
+
+    def watch_client(self, sel: selectors.BaseSelector, conn: socket.socket):
+        """Wait (without blocking the loop) for the next request on a connection."""
+        conn.setblocking(False)
+        # Read state: the 4-byte header first, then a body buffer of exactly its size
+        sel.register(conn, selectors.EVENT_READ, {"buf": bytearray(4), "offset": 0, "header": True})
+
+    def accept_client(self, sel: selectors.BaseSelector, sock: socket.socket):
+        """Accept a connection from the same user (or root) and wait for its request."""
+        conn, _ = sock.accept()
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _pid, uid, _gid = struct.unpack("3i", creds)
+        if uid not in (os.getuid(), 0):
+            conn.close()
+            return
+        self.watch_client(sel, conn)
+
+    def read_client(self, sel: selectors.BaseSelector, conn: socket.socket, state: dict):
+        """Read request bytes in place; dispatch once a full length-prefixed message has arrived."""
+        buf = state["buf"]
+        try:
+            received = conn.recv_into(memoryview(buf)[state["offset"]:])
+        except OSError:
+            received = 0
+        if not received:
+            sel.unregister(conn)
+            conn.close()
+            return
+
+        state["offset"] += received
+        if state["offset"] < len(buf):
+            return
+
+        error = None
+        if state["header"]:
+            (size,) = MESSAGE_HEADER.unpack(buf)
+            if size > MAX_MESSAGE_SIZE:
+                error = f"Message too large: {size} bytes"
+            elif size:
+                state.update(buf=bytearray(size), offset=0, header=False)
+                return
+            else:
+                error = "Empty request"
+
+        sel.unregister(conn)
+        conn.setblocking(True)
+        try:
+            if error:
+                raise ValueError(error)
+            request = json_loads(buf)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
             try:
-                conn.sendall(json.dumps({"status": "error", "error": str(e)}).encode() + b"\n")
-            except:
+                send_message(conn, {"status": "error", "error": str(e)})
+            except OSError:
                 pass
-        finally:
             conn.close()
+            return
+
+        # Only `send` and `await` block (on the sandbox); everything else is
+        # answered inline. Connections stay open for further requests until
+        # the client closes them.
+        if request.get("cmd") in ("send", "await"):
+            self._client_pool.submit(self.respond_in_pool, conn, request)
+        elif self.respond(conn, request):
+            self.watch_client(sel, conn)
 
     def run(self):
         """Run the daemon."""
+        use_fast_json()
         init_db()
 
         if SOCKET_PATH.exists():
@@ -778,6 +1354,8 @@ class Daemon:
 
         print(f"Hermit daemon listening on {SOCKET_PATH}")
         self.running = True
+        self.load_schedule()
+        bwrap_static_args()  # Probe home dirs and copy credentials once, up front
 
         # Start scheduler thread
         self.scheduler_thread = threading.Thread(target=self.run_scheduler, daemon=True)
@@ -789,16 +1367,33 @@ class Daemon:
             reload_thread.start()
             print("Hot reload enabled")
 
+        sel = selectors.DefaultSelector()
+        sel.register(sock, selectors.EVENT_READ)
+        sel.register(self._wake_r, selectors.EVENT_READ)
+
         try:
             while self.running:
-                conn, _ = sock.accept()
-                thread = threading.Thread(target=self.handle_client, args=(conn,))
-                thread.daemon = True
-                thread.start()
+                for key, _ in sel.select():
+                    if key.fileobj is sock:
+                        self.accept_client(sel, sock)
+                    elif key.fileobj is self._wake_r:
+                        self._wake_r.recv(4096)
+                        while not self._returned.empty():
+                            self.watch_client(sel, self._returned.get())
+                    else:
+                        self.read_client(sel, key.fileobj, key.data)
         except KeyboardInterrupt:
             print("\nShutting down...")
         finally:
             self.running = False
+            with self._cv:
+                self._cv.notify()
+            self._pool.shutdown(wait=False)
+            self._client_pool.shutdown(wait=False)
+            for pool in self._async_pools.values():
+                pool.shutdown(wait=False)
+            close_logs()
+            sel.close()
             sock.close()
             SOCKET_PATH.unlink(missing_ok=True)
             PID_FILE.unlink(missing_ok=True)
@@ -808,28 +1403,66 @@ class Daemon:
 # Client
 # ============================================================================
 
-def send_to_daemon(request: dict) -> dict:
-    """Send a request to the daemon."""
-    if not SOCKET_PATH.exists():
-        return {"status": "error", "error": "Daemon not running. Start with: hermit daemon"}
+# Connection to the daemon, opened on first use and reused for the process
+# lifetime. One request/response exchange at a time (guarded by the lock).
+_daemon_sock: socket.socket | None = None
+_daemon_lock = threading.Lock()
+
+
+def _close_daemon_socket():
+    global _daemon_sock
+    if _daemon_sock is not None:
+        _daemon_sock.close()
+        _daemon_sock = None
 
+
+def connect_to_daemon() -> socket.socket:
+    """Open a new connection to the daemon."""
     sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
     try:
         sock.connect(str(SOCKET_PATH))
-        sock.sendall(json.dumps(request).encode() + b"\n")
+    except OSError:
+        sock.close()
+        raise
+    return sock
 
-        data = b""
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            data += chunk
-            if b"\n" in data:
-                break
 
-        return json.loads(data.decode())
-    finally:
-        sock.close()
+def send_to_daemon(request: dict) -> dict:
+    """Send a request to the daemon over the shared connection."""
+    global _daemon_sock
+    not_running = {"status": "error", "error": "Daemon not running. Start with: hermit daemon"}
+    if not SOCKET_PATH.exists():
+        return not_running
+
+    with _daemon_lock:
+        for _ in range(2):
+            reused = _daemon_sock is not None
+            if not reused:
+                try:
+                    _daemon_sock = connect_to_daemon()
+                except OSError:
+                    return not_running  # Stale socket file, or the daemon is mid-reload
+
+            try:
+                send_message(_daemon_sock, request)
+            except ConnectionError:
+                _close_daemon_socket()
+                if reused:
+                    continue  # Stale connection (e.g. daemon reloaded); retry once on a fresh one
+                raise
+
+            # The request is out: never resend it (send/task_add aren't idempotent)
+            try:
+                response = recv_message(_daemon_sock)
+            except ConnectionError:
+                response = None
+            if response is None:
+                _close_daemon_socket()
+                return {"status": "error", "error": "Daemon closed the connection"}
+            return response
+
+    return {"status": "error", "error": "Daemon closed the connection"}
 
 
 # ============================================================================
@@ -923,25 +1556,71 @@ def cmd_new(args):
     print(response.get("message"))
 
 
+def print_repl_results(pending: queue.Queue, interactive: bool):
+    """Await queued REPL prompts in order and print their results.
+
+    Runs on its own thread with its own daemon connection, so the REPL's
+    connection stays free for queueing more prompts.
+    """
+    sock = None
+    while True:
+        req_id = pending.get()
+        try:
+            if sock is None:
+                sock = connect_to_daemon()
+            send_message(sock, {"cmd": "await", "req_id": req_id})
+            response = recv_message(sock) or {"status": "error", "error": "Daemon closed the connection"}
+        except (OSError, ValueError) as e:
+            if sock is not None:
+                sock.close()
+                sock = None
+            response = {"status": "error", "error": str(e)}
+
+        if response.get("status") == "error":
+            print(f"\nError: {response.get('error')}\n")
+        else:
+            print(f"\n{response.get('result', '')}\n")
+        if interactive:
+            print("> ", end="", flush=True)
+        pending.task_done()
+
+
 def cmd_repl(args):
-    """Interactive REPL via daemon."""
+    """Interactive REPL via daemon.
+
+    Prompts are queued with send_async, so the next one can be typed while
+    Claude is still working; results print in order as they finish.
+    """
     print(f"Hermit - chatting in group '{args.group}'")
     print("Type 'exit' or Ctrl+D to quit\n")
 
+    # input() is for people typing; piped prompts are read straight off stdin
+    interactive = sys.stdin.isatty()
+    pending: queue.Queue[int] = queue.Queue()
+    threading.Thread(target=print_repl_results, args=(pending, interactive), daemon=True).start()
+
     while True:
         try:
-            prompt = input("> ").strip()
+            if interactive:
+                prompt = input("> ").strip()
+            else:
+                line = sys.stdin.readline()
+                if not line:
+                    raise EOFError
+                prompt = line.strip()
             if not prompt:
                 continue
             if prompt.lower() == "exit":
+                pending.join()
                 break
             if prompt.lower() == "/new":
+                pending.join()  # Queued prompts finish in the old session
                 send_to_daemon({"cmd": "new_session", "group": args.group})
                 print("Session cleared.\n")
                 continue
 
             response = send_to_daemon({
-                "cmd": "send",
+                "cmd": "send_async",
                 "group": args.group,
                 "prompt": prompt
             })
@@ -949,9 +1628,13 @@ def cmd_repl(args):
             if response.get("status") == "error":
                 print(f"Error: {response.get('error')}\n")
             else:
-                print(f"\n{response.get('result', '')}\n")
+                pending.put(response["req_id"])
 
-        except (EOFError, KeyboardInterrupt):
+        except EOFError:
+            pending.join()
+            print("\nGoodbye!")
+            break
+        except KeyboardInterrupt:
             print("\nGoodbye!")
             break
 
@@ -975,7 +1658,7 @@ def cmd_task_add(args):
         print(f"Error: {response.get('error')}", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Task {response.get('task_id')} created. Next run: {response.get('next_run')}")
+    print(f"Task {response.get('task_id')} created. Next run: {format_ts(response.get('next_run_ts'))}")
 
 
 def cmd_task_list(args):
@@ -991,15 +1674,17 @@ def cmd_task_list(args):
         print("No scheduled tasks.")
         return
 
+    lines = []
     for t in tasks:
         status = t.get("status", "?")
-        print(f"  [{t['id']}] {t['group_name']} | {t['cron']} | {status}")
-        print(f"      Prompt: {t['prompt'][:60]}...")
-        if t.get("next_run"):
-            print(f"      Next: {t['next_run']}")
-        if t.get("last_result"):
-            print(f"      Last: {t['last_result'][:60]}...")
-        print()
+        lines.append(f"  [{t['id']}] {t['group_name']} | {t['cron']} | {status}")
+        lines.append(f"      Prompt: {t['prompt_head']}...")
+        if t.get("next_run_ts") is not None:
+            lines.append(f"      Next: {format_ts(t['next_run_ts'])}")
+        if t.get("last_result_head"):
+            lines.append(f"      Last: {t['last_result_head']}...")
+        lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_task_rm(args):
@@ -1037,13 +1722,15 @@ def cmd_tools_list(args):
     for t in tools:
         print(f"  {t}")
     print("\nAvailable:")
+    installed = set(tools)
     for name in TOOL_URLS:
-        if name not in tools:
+        if name not in installed:
             print(f"  hermit tools install {name}")
 
 
 def cmd_auth(args):
     """Authenticate a tool for hermit's sandbox."""
+    import subprocess
     tool = args.tool
 
     if tool == "gh":
@@ -1053,7 +1740,7 @@ def cmd_auth(args):
 
         # Check if gh is installed
         gh_path = TOOLS_DIR / "gh"
-        if not gh_path.exists():
+        if not gh_path.is_file():
             print("gh not installed. Installing...")
             result = install_tool("gh")
             if result.get("status") == "error":
@@ -1073,10 +1760,43 @@ def cmd_auth(args):
         sys.exit(1)
 
 
-def main():
+def cmd_serve_cli(args):
+    """Run CLI commands read line by line from stdin, in this one process."""
+    parser = get_parser()
+    commands = sys.stdin
+    # Commands must not consume the command stream (e.g. `send` with no prompt)
+    sys.stdin = open(os.devnull)
+    for line in commands:
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            continue
+        if not argv:
+            continue
+        try:
+            line_args = parser.parse_args(argv)
+            line_args.func(line_args)
+        except SystemExit:
+            pass  # Commands exit on errors; keep serving
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+        sys.stdout.flush()
+
+
+def print_help_and_exit(parser: argparse.ArgumentParser):
+    """Show a (sub)command's help when no subcommand was given."""
+    parser.print_help()
+    sys.exit(1)
+
+
+@functools.lru_cache(maxsize=None)
+def get_parser() -> argparse.ArgumentParser:
+    """Get the CLI argument parser (built once per process, then reused)."""
     parser = argparse.ArgumentParser(
         description="Hermit - Personal Claude assistant with bwrap sandboxing"
     )
+    parser.set_defaults(func=lambda a: print_help_and_exit(parser))
     subparsers = parser.add_subparsers(dest="command", help="Commands")
 
     # daemon
@@ -1111,6 +1831,7 @@ def main():
 
     # task (subcommand group)
     p_task = subparsers.add_parser("task", help="Manage scheduled tasks")
+    p_task.set_defaults(func=lambda a: print_help_and_exit(p_task))
     task_sub = p_task.add_subparsers(dest="task_cmd")
 
     # task add
@@ -1136,6 +1857,7 @@ def main():
 
     # tools (subcommand group)
     p_tools = subparsers.add_parser("tools", help="Manage sandbox tools")
+    p_tools.set_defaults(func=lambda a: print_help_and_exit(p_tools))
     tools_sub = p_tools.add_subparsers(dest="tools_cmd")
 
     # tools install
@@ -1151,20 +1873,16 @@ def main():
     p_init = subparsers.add_parser("init", help="Initialize database")
     p_init.set_defaults(func=lambda a: (init_db(), print(f"Database initialized at {DB_PATH}")))
 
-    args = parser.parse_args()
+    # serve-cli (batch many commands through one process)
+    p_serve = subparsers.add_parser("serve-cli", help="Run commands read line by line from stdin")
+    p_serve.set_defaults(func=cmd_serve_cli)
 
-    if args.command is None:
-        parser.print_help()
-        sys.exit(1)
+    return parser
 
-    if args.command == "task" and getattr(args, "task_cmd", None) is None:
-        p_task.print_help()
-        sys.exit(1)
-
-    if args.command == "tools" and getattr(args, "tools_cmd", None) is None:
-        p_tools.print_help()
-        sys.exit(1)
 
+def main():
+    parser = get_parser()
+    args = parser.parse_args()
     args.func(args)
 
 